@@ -1,4 +1,8 @@
 # CALCULATOR
+# Input for demo_calculator.py: this file must stay inside python_subset.lark
+# (def, if/else, assignments, arithmetic, return). Operation dispatch is
+# therefore written as nested if/else - dicts, imports and elif are rejected
+# by the grammar, and the nesting is the branch structure the demo measures.
 
 def add(a, b):
     # Addition
@@ -7,16 +7,19 @@ Demonstrates:
 """
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+_OUTPUT_DIR = os.path.join(_ROOT, 'output')
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+_BAR = "=" * 70
+_SEP = "-" * 20
 
 from test_generator.orchestrator import LangGraphOrchestrator
 from test_generator import config
 
 def main():
-    print("=" * 70)
-    print("DEMO 2: AUTH SYSTEM")
-    print("=" * 70)
-    
     # Auth logic using IF statements (now supported!)
     sample_code = """def check_password_strength(length):
     limit = 5
@@ -36,16 +39,18 @@ def validate_login(attempts, max_attempts):
     return remaining
 """
     
-    print("\nCODE TO ANALYZE:")
-    print(sample_code)
+    sys.stdout.write(
+        f"{_BAR}\nDEMO 2: AUTH SYSTEM\n{_BAR}\n"
+        f"\nCODE TO ANALYZE:\n{sample_code}\n"
+    )
     
     # Check for Google API key
     if not config.GOOGLE_API_KEY:
-        print("\n" + "=" * 70)
-        print("WARNING: Google API key not found!")
-        print("=" * 70)
-        print("Set GOOGLE_API_KEY environment variable")
-        print("=" * 70)
+        sys.stdout.write(
+            f"\n{_BAR}\nWARNING: Google API key not found!\n{_BAR}\n"
+            "Set GOOGLE_API_KEY environment variable\n"
+            f"{_BAR}\n"
+        )
         return
     
     # Initialize Orchestrator with LangChain LLM
@@ -60,20 +65,18 @@ def validate_login(attempts, max_attempts):
             # target_coverage uses default from config.py (80.0)
         )
         
-        print("\n" + "=" * 70)
-        print("SIMULATION RESULT: SUCCESS")
-        print("=" * 70)
-        print(f"Tests Generated: {result.get('tests_count', 0)}")
-        print(f"Final Branch Coverage:  {result.get('branch_coverage', 0):.1f}%")
-        print(f"Final Statement Cov.:   {result.get('total_coverage', 0):.1f}%")
-        
-        print("\nGENERATED TESTS PREVIEW:")
-        print("-" * 20)
-        print(result.get("tests", "")[:300] + "...\n(truncated)")
+        sys.stdout.write(
+            f"\n{_BAR}\nSIMULATION RESULT: SUCCESS\n{_BAR}\n"
+            f"Tests Generated: {result.get('tests_count', 0)}\n"
+            f"Final Branch Coverage:  {result.get('branch_coverage', 0):.1f}%\n"
+            f"Final Statement Cov.:   {result.get('total_coverage', 0):.1f}%\n"
+            f"\nGENERATED TESTS PREVIEW:\n{_SEP}\n"
+            f"{result.get('tests', '')[:300]}...\n(truncated)\n"
+        )
         
         # Save output
-        output_path = os.path.join(os.path.dirname(__file__), '..', 'output', 'test_auth.py')
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_path = os.path.join(_OUTPUT_DIR, 'test_auth.py')
+        os.makedirs(_OUTPUT_DIR, exist_ok=True)
         with open(output_path, 'w') as f:
             f.write(result.get("tests", ""))
         print(f"\nFull tests saved to: output/test_auth.py")
@@ -9,45 +9,36 @@ Demonstrates:
 """
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+_OUTPUT_DIR = os.path.join(_ROOT, 'output')
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+_BAR = "=" * 70
+_SEP70 = "-" * 70
 
 from test_generator.orchestrator import LangGraphOrchestrator
 from test_generator import config
+from demos.sample_loader import load_sample
 
 def main():
-    print("=" * 70)
-    print("DEMO 3: CALCULATOR")
-    print("=" * 70)
-    
-    # Read calculator code from file
-    calculator_file = os.path.join(os.path.dirname(__file__), 'calculator.py')
-    with open(calculator_file, 'r', encoding='utf-8') as f:
-        sample_code = f.read()
-    
-    # Extract only function definitions (remove docstring header)
-    lines = sample_code.split('\n')
-    code_lines = []
-    in_code = False
-    for line in lines:
-        if line.startswith('def '):
-            in_code = True
-        if in_code:
-            code_lines.append(line)
-    
-    sample_code = '\n'.join(code_lines)
+    # Read calculator code from file (function definitions only)
+    calculator_file = os.path.join(_HERE, 'calculator.py')
+    sample_code = load_sample(calculator_file)
     
-    print("\nCODE TO ANALYZE:")
-    print("-" * 70)
-    print(sample_code[:400] + "...\n")
-    print("-" * 70)
+    sys.stdout.write(
+        f"{_BAR}\nDEMO 3: CALCULATOR\n{_BAR}\n"
+        f"\nCODE TO ANALYZE:\n{_SEP70}\n{sample_code[:400]}...\n\n{_SEP70}\n"
+    )
     
     # Check for Google API key
     if not config.GOOGLE_API_KEY:
-        print("\n" + "=" * 70)
-        print("WARNING: Google API key not found!")
-        print("=" * 70)
-        print("Set GOOGLE_API_KEY environment variable")
-        print("=" * 70)
+        sys.stdout.write(
+            f"\n{_BAR}\nWARNING: Google API key not found!\n{_BAR}\n"
+            "Set GOOGLE_API_KEY environment variable\n"
+            f"{_BAR}\n"
+        )
         return
     
     # Initialize Orchestrator with LangChain LLM
@@ -61,25 +52,24 @@ def main():
             # target_coverage uses default from config.py (80.0)
         )
         
-        print("\n" + "=" * 70)
-        print("SIMULATION RESULT: SUCCESS")
-        print("=" * 70)
-        print(f"Functions Analyzed: 5 (add, subtract, multiply, divide, calculator)")
-        print(f"Tests Generated: {result.get('tests_count', 0)}")
-        print(f"Final Branch Coverage:  {result.get('branch_coverage', 0):.1f}%")
-        print(f"Final Statement Cov.:   {result.get('total_coverage', 0):.1f}%")
-        
-        print("\nLANGUAGE FEATURES DEMONSTRATED:")
-        print("  + Multiple function definitions (5)")
-        print("  + Arithmetic operations (+, -, *, /)")
-        print("  + Nested if/else statements (menu logic)")
-        print("  + Error handling (division by zero)")
-        print("  + Return statements")
-        print("  + Comparisons (==, !=)")
+        sys.stdout.write(
+            f"\n{_BAR}\nSIMULATION RESULT: SUCCESS\n{_BAR}\n"
+            "Functions Analyzed: 5 (add, subtract, multiply, divide, calculator)\n"
+            f"Tests Generated: {result.get('tests_count', 0)}\n"
+            f"Final Branch Coverage:  {result.get('branch_coverage', 0):.1f}%\n"
+            f"Final Statement Cov.:   {result.get('total_coverage', 0):.1f}%\n"
+            "\nLANGUAGE FEATURES DEMONSTRATED:\n"
+            "  + Multiple function definitions (5)\n"
+            "  + Arithmetic operations (+, -, *, /)\n"
+            "  + Nested if/else statements (menu logic)\n"
+            "  + Error handling (division by zero)\n"
+            "  + Return statements\n"
+            "  + Comparisons (==, !=)\n"
+        )
         
         # Save output
-        output_path = os.path.join(os.path.dirname(__file__), '..', 'output', 'test_calculator.py')
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_path = os.path.join(_OUTPUT_DIR, 'test_calculator.py')
+        os.makedirs(_OUTPUT_DIR, exist_ok=True)
         with open(output_path, 'w') as f:
             f.write(result.get("tests", ""))
         print(f"\nFull tests saved to: output/test_calculator.py")
@@ -11,50 +11,44 @@ Demonstrates MAXIMUM COMPLEXITY to activate Coverage Optimizer:
 """
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+_OUTPUT_DIR = os.path.join(_ROOT, 'output')
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+_BAR = "=" * 70
+_SEP70 = "-" * 70
 
 from test_generator.orchestrator import LangGraphOrchestrator
 from test_generator import config
+from demos.sample_loader import load_sample
 
 def main():
-    print("=" * 70)
-    print("DEMO 4: COMPLEX BANKING SYSTEM - MAXIMUM COVERAGE CHALLENGE")
-    print("=" * 70)
-    
-    # Read extreme system code from file
-    extreme_file = os.path.join(os.path.dirname(__file__), 'extreme_system.py')
-    with open(extreme_file, 'r', encoding='utf-8') as f:
-        sample_code = f.read()
+    # Read extreme system code from file (function definitions only)
+    extreme_file = os.path.join(_HERE, 'extreme_system.py')
+    sample_code = load_sample(extreme_file)
     
-    # Extract only function definitions
-    lines = sample_code.split('\n')
-    code_lines = []
-    in_code = False
-    for line in lines:
-        if line.startswith('def '):
-            in_code = True
-        if in_code:
-            code_lines.append(line)
+    line_count = sample_code.count('\n') + 1
     
-    sample_code = '\n'.join(code_lines)
-    
-    print("\nCODE TO ANALYZE:")
-    print("-" * 70)
-    print(f"Total lines: {len(sample_code.split(chr(10)))}")
-    print(f"Functions: 3 (ultra-complex banking)")
-    print(f"Estimated branches: 80+")
-    print("-" * 70)
-    print(sample_code[:500] + "...\n[TRUNCATED - Full code in extreme_system.py]")
-    print("-" * 70)
-
+    sys.stdout.write(
+        f"{_BAR}\nDEMO 4: COMPLEX BANKING SYSTEM - MAXIMUM COVERAGE CHALLENGE\n{_BAR}\n"
+        f"\nCODE TO ANALYZE:\n{_SEP70}\n"
+        f"Total lines: {line_count}\n"
+        "Functions: 3 (ultra-complex banking)\n"
+        "Estimated branches: 80+\n"
+        f"{_SEP70}\n"
+        f"{sample_code[:500]}...\n[TRUNCATED - Full code in extreme_system.py]\n"
+        f"{_SEP70}\n"
+    )
     
     # Check for Google API key
     if not config.GOOGLE_API_KEY:
-        print("\n" + "=" * 70)
-        print("WARNING: Google API key not found!")
-        print("=" * 70)
-        print("Set GOOGLE_API_KEY environment variable")
-        print("=" * 70)
+        sys.stdout.write(
+            f"\n{_BAR}\nWARNING: Google API key not found!\n{_BAR}\n"
+            "Set GOOGLE_API_KEY environment variable\n"
+            f"{_BAR}\n"
+        )
         return
     
     # Initialize Orchestrator with verbose mode
@@ -70,21 +64,21 @@ def main():
             # target_coverage uses default from config.py (80.0)
         )
         
-        print("\n" + "=" * 70)
-        print("SIMULATION RESULT: SUCCESS")
-        print("=" * 70)
-        print(f"Functions Analyzed: 3 (Ultra-Complex)")
-        print("  1. ultra_complex_loan_scoring (6+ levels deep, 40+ branches)")
-        print("  2. multi_tier_interest_calculator (5 levels deep, 25+ branches)")
-        print("  3. advanced_fraud_detection (4 levels deep, 20+ branches)")
-        
-        print(f"\nTests Generated: {result.get('tests_count', 0)}")
-        print(f"Final Branch Coverage:  {result.get('branch_coverage', 0):.1f}%")
-        print(f"Final Statement Cov.:   {result.get('total_coverage', 0):.1f}%")
+        sys.stdout.write(
+            f"\n{_BAR}\nSIMULATION RESULT: SUCCESS\n{_BAR}\n"
+            "Functions Analyzed: 3 (Ultra-Complex)\n"
+            "  1. ultra_complex_loan_scoring (6+ levels deep, 40+ branches)\n"
+            "  2. multi_tier_interest_calculator (5 levels deep, 25+ branches)\n"
+            "  3. advanced_fraud_detection (4 levels deep, 20+ branches)\n"
+            "\n"
+            f"Tests Generated: {result.get('tests_count', 0)}\n"
+            f"Final Branch Coverage:  {result.get('branch_coverage', 0):.1f}%\n"
+            f"Final Statement Cov.:   {result.get('total_coverage', 0):.1f}%\n"
+        )
         
         # Save output
-        output_path = os.path.join(os.path.dirname(__file__), '..', 'output', 'test_extreme_banking.py')
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_path = os.path.join(_OUTPUT_DIR, 'test_extreme_banking.py')
+        os.makedirs(_OUTPUT_DIR, exist_ok=True)
         with open(output_path, 'w') as f:
             f.write(result.get("tests", ""))
         print(f"\nFull tests saved to: output/test_extreme_banking.py")
@@ -7,16 +7,19 @@ Demonstrates:
 """
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+_OUTPUT_DIR = os.path.join(_ROOT, 'output')
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+_BAR = "=" * 70
+_SEP = "-" * 20
 
 from test_generator.orchestrator import LangGraphOrchestrator
 from test_generator import config
 
 def main():
-    print("=" * 70)
-    print("DEMO 1: SIMPLE FUNCTION (Strict Mode Compliant)")
-    print("=" * 70)
-    
     # Simple addition function
     # Complies with python_subset.lark (def, return, assignment, math)
     sample_code = """def add(x, y):
@@ -28,18 +31,20 @@ def main():
     return result
 """
     
-    print("\nCODE TO ANALYZE:")
-    print(sample_code)
+    sys.stdout.write(
+        f"{_BAR}\nDEMO 1: SIMPLE FUNCTION (Strict Mode Compliant)\n{_BAR}\n"
+        f"\nCODE TO ANALYZE:\n{sample_code}\n"
+    )
     
     # Check for Google API key
     if not config.GOOGLE_API_KEY:
-        print("\n" + "=" * 70)
-        print("WARNING: Google API key not found!")
-        print("=" * 70)
-        print("Set GOOGLE_API_KEY environment variable")
-        print("Example (Windows): $env:GOOGLE_API_KEY='your-key-here'")
-        print("Example (Linux/Mac): export GOOGLE_API_KEY='your-key-here'")
-        print("=" * 70)
+        sys.stdout.write(
+            f"\n{_BAR}\nWARNING: Google API key not found!\n{_BAR}\n"
+            "Set GOOGLE_API_KEY environment variable\n"
+            "Example (Windows): $env:GOOGLE_API_KEY='your-key-here'\n"
+            "Example (Linux/Mac): export GOOGLE_API_KEY='your-key-here'\n"
+            f"{_BAR}\n"
+        )
         return
     
     # Initialize Orchestrator with LangChain LLM
@@ -53,20 +58,18 @@ def main():
             # target_coverage uses default from config.py (80.0)
         )
         
-        print("\n" + "=" * 70)
-        print("SIMULATION RESULT: SUCCESS")
-        print("=" * 70)
-        print(f"Tests Generated: {result.get('tests_count', 0)}")
-        print(f"Final Branch Coverage:  {result.get('branch_coverage', 0):.1f}%")
-        print(f"Final Statement Cov.:   {result.get('total_coverage', 0):.1f}%")
-        
-        print("\nGENERATED TESTS PREVIEW:")
-        print("-" * 20)
-        print(result.get("tests", "")[:300] + "...\n(truncated)")
+        sys.stdout.write(
+            f"\n{_BAR}\nSIMULATION RESULT: SUCCESS\n{_BAR}\n"
+            f"Tests Generated: {result.get('tests_count', 0)}\n"
+            f"Final Branch Coverage:  {result.get('branch_coverage', 0):.1f}%\n"
+            f"Final Statement Cov.:   {result.get('total_coverage', 0):.1f}%\n"
+            f"\nGENERATED TESTS PREVIEW:\n{_SEP}\n"
+            f"{result.get('tests', '')[:300]}...\n(truncated)\n"
+        )
         
         # Save output
-        output_path = os.path.join(os.path.dirname(__file__), '..', 'output', 'test_simple.py')
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_path = os.path.join(_OUTPUT_DIR, 'test_simple.py')
+        os.makedirs(_OUTPUT_DIR, exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(result.get("tests", ""))
         print(f"\nFull tests saved to: output/test_simple.py")
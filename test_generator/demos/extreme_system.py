@@ -1,3 +1,9 @@
+# EXTREME BANKING SYSTEM
+# Input for demo_complex.py: this file must stay inside python_subset.lark
+# (def, if/else, assignments, arithmetic, return). The scoring rules are
+# therefore nested if/else chains - lookup tables, imports and elif are
+# rejected by the grammar, and the deep nesting is the coverage challenge.
+
 def ultra_complex_loan_scoring(income, debt, age, employment_years, credit_history):
     # Ultra-complex scoring system with many edge cases
     base_score = 500
@@ -39,8 +45,7 @@ def ultra_complex_loan_scoring(income, debt, age, employment_years, credit_histo
                 # Age adjustment
                 if age < 18:
                     # Too young
-                    disqualify = 0 - 1000
-                    return disqualify
+                    return 0 - 1000
                 else:
                     if age < 25:
                         age_penalty = 30
@@ -63,8 +68,7 @@ def ultra_complex_loan_scoring(income, debt, age, employment_years, credit_histo
                 
                 # Employment seniority adjustment
                 if employment_years < 0:
-                    disqualify = 0 - 2000
-                    return disqualify
+                    return 0 - 2000
                 else:
                     if employment_years < 1:
                         emp_penalty = 50
@@ -87,8 +91,7 @@ def ultra_complex_loan_scoring(income, debt, age, employment_years, credit_histo
                 
                 # Credit history adjustment
                 if credit_history < 0:
-                    disqualify = 0 - 3000
-                    return disqualify
+                    return 0 - 3000
                 else:
                     if credit_history == 0:
                         # No credit history
@@ -124,16 +127,13 @@ def ultra_complex_loan_scoring(income, debt, age, employment_years, credit_histo
 def multi_tier_interest_calculator(principal, base_rate, tier, loyalty_years, auto_pay):
     # Interest calculation with multiple tiers
     if principal <= 0:
-        error = 0 - 1
-        return error
+        return 0 - 1
     else:
         if base_rate < 0:
-            error = 0 - 2
-            return error
+            return 0 - 2
         else:
             if base_rate > 100:
-                error = 0 - 3
-                return error
+                return 0 - 3
             else:
                 effective_rate = base_rate
                 
@@ -164,13 +164,11 @@ def multi_tier_interest_calculator(principal, base_rate, tier, loyalty_years, au
                                     effective_rate = effective_rate + tier_discount
                                 else:
                                     # Invalid tier
-                                    error = 0 - 4
-                                    return error
+                                    return 0 - 4
                 
                 # Loyalty adjustment
                 if loyalty_years < 0:
-                    error = 0 - 5
-                    return error
+                    return 0 - 5
                 else:
                     if loyalty_years == 0:
                         # New customer
@@ -204,8 +202,7 @@ def multi_tier_interest_calculator(principal, base_rate, tier, loyalty_years, au
                         effective_rate = effective_rate + autopay_adj
                     else:
                         # Invalid auto_pay value
-                        error = 0 - 6
-                        return error
+                        return 0 - 6
                 
                 # Final calculation
                 if effective_rate < 0:
@@ -273,6 +270,11 @@ def advanced_fraud_detection(transaction_amount, usual_amount, location_match, t
                 location_risk = 40
                 risk_score = risk_score + location_risk
         
+        # Risk only grows from here: block as soon as the threshold is hit
+        if risk_score >= 100:
+            decision = 0
+            return decision
+        
         # Time check
         if time_match == 1:
             # Normal time
@@ -288,6 +290,11 @@ def advanced_fraud_detection(transaction_amount, usual_amount, location_match, t
                 time_risk = 30
                 risk_score = risk_score + time_risk
         
+        # Risk only grows from here: block as soon as the threshold is hit
+        if risk_score >= 100:
+            decision = 0
+            return decision
+        
         # Device check
         if device_match == 1:
             # Recognized device
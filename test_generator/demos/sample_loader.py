@@ -0,0 +1,16 @@
+"""
+Shared helper for the demos that analyze a sample source file.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# Start of the first top-level function (everything above it is file header)
+_FIRST_DEF_RE = re.compile(r'^def ', re.MULTILINE)
+
+@lru_cache(maxsize=8)
+def load_sample(path: str) -> str:
+    """Read a demo source file, dropping the header above the first function."""
+    text = Path(path).read_text(encoding='utf-8')
+    first_def = _FIRST_DEF_RE.search(text)
+    return text[first_def.start():] if first_def else text
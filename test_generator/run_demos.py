@@ -6,29 +6,53 @@ Launcher unico per tutte le demo del progetto
 import sys
 import os
 
+SEP = "=" * 70
+DASH = "-" * 70
+DEMO_NAMES = {1: "Simple", 2: "Auth", 3: "Calculator", 4: "Complex"}
+MENU = "\n".join([
+    "",
+    SEP,
+    "MULTI-AGENT TEST GENERATOR - DEMO LAUNCHER",
+    SEP,
+    "",
+    "Demo disponibili:",
+    "  1. Simple Demo    - Funzione base con branch (add)",
+    "  2. Auth Demo      - Logica condizionale (password/login)",
+    "  3. Calculator     - Menu aritmetico completo (5 funzioni)",
+    "  4. Complex Demo   - Validazione complessa (14+ branch)",
+    "  0. Esci",
+])
+
 def main():
+    from test_generator import clean_output
+    clean_output()  # Start each launcher session with an empty output/
+    
+    # Import every demo once, then dispatch by number
+    import demos.demo_simple
+    import demos.demo_auth
+    import demos.demo_calculator
+    import demos.demo_complex
+    demo_handlers = {
+        1: demos.demo_simple.main,
+        2: demos.demo_auth.main,
+        3: demos.demo_calculator.main,
+        4: demos.demo_complex.main,
+    }
+    
     running = True
-    executed_demos = set()  # Track which demos have been executed
+    executed_mask = 0  # Bit N set once demo N has been executed
     
     while running:
-        print("\n" + "=" * 70)
-        print("MULTI-AGENT TEST GENERATOR - DEMO LAUNCHER")
-        print("=" * 70)
-        print("\nDemo disponibili:")
-        print("  1. Simple Demo    - Funzione base con branch (add)")
-        print("  2. Auth Demo      - Logica condizionale (password/login)")
-        print("  3. Calculator     - Menu aritmetico completo (5 funzioni)")
-        print("  4. Complex Demo   - Validazione complessa (14+ branch)")
-        print("  0. Esci")
+        print(MENU)
         
         # Show executed demos status
-        if executed_demos:
+        if executed_mask:
             print("\nDemo già eseguite:")
-            demo_names = {1: "Simple", 2: "Auth", 3: "Calculator", 4: "Complex"}
-            for num in sorted(executed_demos):
-                print(f"  ✓ [{num}] {demo_names[num]} - Risultati stampati dalla demo")
+            for num in DEMO_NAMES:
+                if executed_mask >> num & 1:
+                    print(f"  ✓ [{num}] {DEMO_NAMES[num]} - Risultati stampati dalla demo")
         
-        print("-" * 70)
+        print(DASH)
         
         try:
             choice = input("\nScegli demo (1-4, 0 per uscire): ").strip()
@@ -40,36 +64,23 @@ def main():
                 demo_num = int(choice)
                 
                 # Check if already executed
-                if demo_num in executed_demos:
-                    demo_name = {1: "Simple", 2: "Auth", 3: "Calculator", 4: "Complex"}[demo_num]
-                    print(f"\n[ℹ] Demo {demo_num} ({demo_name}) già eseguita!")
+                if executed_mask & (1 << demo_num):
+                    print(f"\n[ℹ] Demo {demo_num} ({DEMO_NAMES[demo_num]}) già eseguita!")
                     print(f"    I test generati sono salvati in: output/test_*.py")
                     print("\n[Premi Invio per continuare...]")
                     input()
                     continue
                 
                 # Execute demo
-                demo_names = {1: "Simple", 2: "Auth", 3: "Calculator", 4: "Complex"}
-                print(f"\n>> Avvio DEMO {demo_num}: {demo_names[demo_num]}...")
-                print("=" * 70)
+                print(f"\n>> Avvio DEMO {demo_num}: {DEMO_NAMES[demo_num]}...")
+                print(SEP)
                 
-                if choice == "1":
-                    import demos.demo_simple as demo
-                    demo.main()
-                elif choice == "2":
-                    import demos.demo_auth as demo
-                    demo.main()
-                elif choice == "3":
-                    import demos.demo_calculator as demo
-                    demo.main()
-                elif choice == "4":
-                    import demos.demo_complex as demo
-                    demo.main()
+                demo_handlers[demo_num]()
                 
                 # Mark as executed (demo already printed all results above)
-                executed_demos.add(demo_num)
+                executed_mask |= 1 << demo_num
                 
-                print("\n" + "=" * 70)
+                print("\n" + SEP)
                 print("[Demo completata. I risultati sono stampati sopra.]")
                 print("Test salvati in: output/test_*.py")
                 print("[Premi Invio per continuare...]")
@@ -52,6 +52,10 @@ setup(
             "flake8",
             "mypy",
         ],
+        # Optional faster JSON decoding of coverage reports
+        "speedups": [
+            "orjson>=3.9.0",
+        ],
     },
     include_package_data=True,
 )
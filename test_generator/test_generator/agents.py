@@ -3,43 +3,84 @@ Specialized agents for test generation system.
 Each agent has a specific role in the test generation workflow.
 """
 
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional, Union
 import ast
+import logging
 import os
+import re
+import threading
 from lark import Lark, UnexpectedInput
 from lark.indenter import Indenter
 from .llm_client import BaseLLMClient
-from .prompts import UNIT_TEST_GENERATOR_SYSTEM_PROMPT, COVERAGE_OPTIMIZER_SYSTEM_PROMPT
+from .prompts import (
+    UNIT_TEST_GENERATOR_SYSTEM_PROMPT,
+    COVERAGE_OPTIMIZER_SYSTEM_PROMPT,
+    build_test_generation_prompt,
+    build_coverage_optimization_prompt,
+)
 from .code_analysis import CodeAnalyzer
 from . import config
 
+# Child of the "test_generator" logger configured in config: handlers and level are
+# inherited from there, nothing is reconfigured per agent instance
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=128)
+def _count_tests_cached(test_code: str) -> int:
+    """Count test functions, memoized on the code so optimization loops don't re-parse."""
+    try:
+        tree = ast.parse(test_code)
+    except SyntaxError:
+        # Fallback to textual parsing if AST parsing fails
+        return test_code.count("def test_")
+    return _count_tests_in_tree(tree)
+
+
+def _count_tests_in_tree(tree: ast.Module) -> int:
+    """Count test functions in an already parsed module."""
+    # pytest only collects module-level functions and methods of module-level classes
+    count = 0
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            count += sum(1 for child in node.body if _is_test_function(child))
+        elif _is_test_function(node):
+            count += 1
+    return count
+
+
+def _is_test_function(node: ast.AST) -> bool:
+    """Check if a node is a test_* function (async tests included, e.g. pytest-asyncio)."""
+    return isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test_")
+
+
+# Fenced blocks of an LLM response: a "python"-tagged block is preferred over any
+# other fence, so a shell/output snippet before the code is not taken as the tests
+_PYTHON_FENCE_RE = re.compile(r"```python(.*?)(?:```|\Z)", re.DOTALL)
+_CODE_FENCE_RE = re.compile(r"```(.*?)(?:```|\Z)", re.DOTALL)
+
 
 class Agent:
     """Base class for all agents."""
     def __init__(self, client: BaseLLMClient) -> None:
         self.client = client
-        self.logger = config.setup_logging(getattr(client, "verbose", False))
+        self.logger = logger
 
     @staticmethod
-    def _count_tests(test_code: str) -> int:
+    def _count_tests(test_code: str, tree: Optional[ast.Module] = None) -> int:
         """Count number of test functions in code using AST.
         
         Args:
             test_code: Python test code
+            tree: AST of test_code if the caller already parsed it
             
         Returns:
             Number of test functions found
         """
-        try:
-            tree = ast.parse(test_code)
-            count = 0
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and node.name.startswith("test_"):
-                    count += 1
-            return count
-        except SyntaxError:
-            # Fallback to textual parsing if AST parsing fails
-            return test_code.count("def test_")
+        if tree is not None:
+            return _count_tests_in_tree(tree)
+        return _count_tests_cached(test_code)
 
     def _extract_code(self, response: str) -> str:
         """Extract Python code from response, removing markdown formatting.
@@ -50,15 +91,9 @@ class Agent:
         Returns:
             Extracted Python code
         """
-        # Clean up potential markdown formatting
-        if "```python" in response:
-            code = response.split("```python")[1].split("```")[0].strip()
-        elif "```" in response:
-            code = response.split("```")[1].split("```")[0].strip()
-        else:
-            code = response.strip()
-
-        return code
+        # Clean up potential markdown formatting (an unclosed fence runs to the end)
+        match = _PYTHON_FENCE_RE.search(response) or _CODE_FENCE_RE.search(response)
+        return (match.group(1) if match else response).strip()
 
 
 class PythonIndenter(Indenter):
@@ -72,8 +107,41 @@ class PythonIndenter(Indenter):
     tab_len = config.PYTHON_INDENT_SIZE  # Use config constant instead of magic number
 
 
-# Module-level cache for Lark parser (optimization: load grammar only once)
+# Module-level cache for Lark parser (optimization: load grammar only once).
+# The LALR tables are also cached on disk by Lark itself (cache=True below), so a
+# fresh process unpickles them instead of rebuilding them from the grammar.
+# Holds (grammar_mtime, parser) so an edited grammar file is picked up.
 _LARK_PARSER_CACHE = None
+_LARK_PARSER_LOCK = threading.Lock()
+_GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), "python_subset.lark")
+
+
+def _get_lark_parser() -> Lark:
+    """Return the shared Lark parser, building it once per grammar revision.
+
+    Thread-safe: concurrent callers never build the LALR tables twice.
+
+    Returns:
+        Lark parser for python_subset.lark
+    """
+    global _LARK_PARSER_CACHE
+
+    mtime = os.path.getmtime(_GRAMMAR_PATH)
+    cached = _LARK_PARSER_CACHE
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _LARK_PARSER_LOCK:
+        # Re-check: another thread may have built it while we waited
+        if _LARK_PARSER_CACHE is None or _LARK_PARSER_CACHE[0] != mtime:
+            with open(_GRAMMAR_PATH, "r", encoding="utf-8") as f:
+                grammar = f.read()
+            parser = Lark(
+                grammar, start="start", parser="lalr", postlex=PythonIndenter(),
+                cache=True,  # Temp-dir file keyed by grammar/options/Lark version hash
+            )
+            _LARK_PARSER_CACHE = (mtime, parser)
+        return _LARK_PARSER_CACHE[1]
 
 
 class CodeAnalyzerAgent(Agent):
@@ -84,27 +152,15 @@ class CodeAnalyzerAgent(Agent):
 
     def __init__(self, client: BaseLLMClient) -> None:
         super().__init__(client)
-        
-        # Use module-level cache to avoid reloading grammar on every instantiation
-        global _LARK_PARSER_CACHE
-        
-        if _LARK_PARSER_CACHE is None:
-            # Load Lark grammar only once
-            try:
-                grammar_path = os.path.join(os.path.dirname(__file__), "python_subset.lark")
-                with open(grammar_path, "r", encoding="utf-8") as f:
-                    grammar = f.read()
-                _LARK_PARSER_CACHE = Lark(grammar, start="start", parser="lalr", postlex=PythonIndenter())
-                self.lark_enabled = True
-            except Exception as e:
-                self.logger.warning(f"Could not load Lark grammar: {e}")
-                _LARK_PARSER_CACHE = None
-                self.lark_enabled = False
-        else:
-            # Use cached parser
-            self.lark_enabled = _LARK_PARSER_CACHE is not None
-        
-        self.parser = _LARK_PARSER_CACHE
+
+        # Shared parser: the grammar is loaded once, not on every instantiation
+        try:
+            self.parser = _get_lark_parser()
+            self.lark_enabled = True
+        except Exception as e:
+            self.logger.warning(f"Could not load Lark grammar: {e}")
+            self.parser = None
+            self.lark_enabled = False
 
     def analyze(self, code: str) -> Dict[str, Any]:
         """
@@ -172,7 +228,7 @@ class UnitTestGeneratorAgent(Agent):
     def generate_tests(
         self, 
         code: str, 
-        branch_map: Dict[str, Any], 
+        branch_map: Union[Dict[str, Any], str], 
         module_name: str = "code_to_test", 
         verbose: bool = False
     ) -> str:
@@ -181,7 +237,7 @@ class UnitTestGeneratorAgent(Agent):
 
         Args:
             code: Source code to test
-            branch_map: Branch map from CodeAnalyzer
+            branch_map: Branch map from CodeAnalyzer (or its serialize_branch_map JSON)
             module_name: Name of the module being tested
             verbose: If True, print debug messages
 
@@ -192,7 +248,6 @@ class UnitTestGeneratorAgent(Agent):
             self.logger.info("Generating tests...")
         
         # Use prompts module for prompt construction (DRY principle)
-        from .prompts import build_test_generation_prompt
         prompt = build_test_generation_prompt(code, branch_map, module_name)
 
         response = self.client.generate(prompt=prompt, system_prompt=UNIT_TEST_GENERATOR_SYSTEM_PROMPT)
@@ -202,7 +257,7 @@ class UnitTestGeneratorAgent(Agent):
             tree = ast.parse(tests)
         except SyntaxError as e:
             return {"error": str(e), "functions": [], "total_branches_in_file": 0}
-        test_count = self._count_tests(tests)
+        test_count = self._count_tests(tests, tree)
         if verbose:
             self.logger.info(f"Generated {test_count} tests")
 
@@ -219,7 +274,7 @@ class CoverageOptimizerAgent(Agent):
         code: str,
         current_tests: str,
         coverage_result: Dict[str, Any],
-        branch_map: Dict[str, Any],
+        branch_map: Union[Dict[str, Any], str],
         module_name: str = "code_to_test",
         verbose: bool = False,
     ) -> str:
@@ -230,7 +285,7 @@ class CoverageOptimizerAgent(Agent):
             code: Source code
             current_tests: Existing test suite
             coverage_result: Coverage report with uncovered branches
-            branch_map: Original branch map
+            branch_map: Original branch map (or its serialize_branch_map JSON)
             module_name: Module name
 
         Returns:
@@ -238,10 +293,18 @@ class CoverageOptimizerAgent(Agent):
         """
         if verbose:
             self.logger.info(f"Current coverage: {coverage_result.get('branch_coverage', 0):.1f}%")
+        
+        # Nothing to target: skip the LLM round-trip (the orchestrator already ends
+        # the loop in this case; this guards direct callers)
+        if not coverage_result.get("uncovered_branches"):
+            if verbose:
+                self.logger.info("No uncovered branches reported, no additional tests needed")
+            return ""
+        
+        if verbose:
             self.logger.info("Generating additional tests...")
         
         # Use prompts module for prompt construction (DRY principle)
-        from .prompts import build_coverage_optimization_prompt
         prompt = build_coverage_optimization_prompt(
             code, current_tests, coverage_result, branch_map, module_name
         )
@@ -4,13 +4,174 @@ Uses Python's ast module for static analysis.
 """
 
 import ast
-from typing import List, Dict, Any
-from .models import BranchInfo, FunctionInfo
+from functools import lru_cache
+from typing import List, Dict, Any, Union
+
+
+def _analyze_function(
+    node: Union[ast.FunctionDef, ast.AsyncFunctionDef], branches: List[Dict[str, Any]], decisions: int
+) -> Dict[str, Any]:
+    """
+    Build the function entry for a function node from its collected branches and decision count.
+
+    The dict has the FunctionInfo shape; it is validated once when the
+    orchestrator builds the BranchMap model.
+    """
+    name = node.name
+
+    # Extract arguments
+    args = []
+    for arg in node.args.args:
+        arg_type = _get_annotation(arg.annotation)
+        args.append({"name": arg.arg, "type": arg_type})
+
+    # Extract return type
+    return_type = _get_annotation(node.returns)
+
+    # Calculate cyclomatic complexity (simplified)
+    # Complexity = 1 + number of decision points (only if supported by grammar)
+    complexity = 1 + decisions
+
+    # Total branches includes if/else (only constructs in grammar)
+    total_branches = len(branches) if branches else 0
+
+    return {
+        "name": name,
+        "args": args,
+        "return_type": return_type,
+        "branches": branches,
+        "cyclomatic_complexity": complexity,
+        "total_branches": total_branches,
+        "lineno": node.lineno,
+    }
+
+
+def _get_annotation(node) -> str:
+    """Extract type annotation from node."""
+    if node is None:
+        return "Any"
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant):
+        return str(node.value)
+    if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and isinstance(node.slice, ast.Name):
+        # Common generic-of-name shape, e.g. List[int]
+        return f"{node.value.id}[{node.slice.id}]"
+    return ast.unparse(node)
+
+
+class _Frame:
+    """Per-function accumulator on the collector stack."""
+
+    __slots__ = ("branches", "decisions")
+
+    def __init__(self) -> None:
+        self.branches: List[Dict[str, Any]] = []  # BranchInfo-shaped dicts
+        self.decisions = 0  # if statements, counted as they are visited
+
+
+class _Collector(ast.NodeVisitor):
+    """
+    Single-pass visitor collecting functions and their branch points.
+
+    Each FunctionDef pushes a fresh _Frame onto a stack, so every If
+    is attributed to its innermost enclosing function only. Functions are
+    recorded in definition order.
+    """
+
+    def __init__(self, source_lines: List[str]) -> None:
+        self.functions: List[Dict[str, Any]] = []
+        self._stack: List[_Frame] = []
+        self._source_lines = source_lines
+
+    def _segment(self, node: ast.expr) -> str:
+        """Return the source text of an expression, sliced from the original code."""
+        if node.lineno == node.end_lineno:
+            # Column offsets are UTF-8 byte offsets
+            line = self._source_lines[node.lineno - 1].encode("utf-8")
+            return line[node.col_offset : node.end_col_offset].decode("utf-8")
+        segment = ast.get_source_segment("\n".join(self._source_lines), node)
+        return segment if segment is not None else "condition"
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        index = len(self.functions)
+        self.functions.append(None)  # Reserve the slot; nested defs come after
+        frame = _Frame()
+        self._stack.append(frame)
+        for child in node.body:
+            self.visit(child)
+        self._stack.pop()
+        self.functions[index] = _analyze_function(node, frame.branches, frame.decisions)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit(self, node: ast.AST) -> None:
+        # One dict lookup on the exact node type, instead of NodeVisitor building
+        # "visit_" + class name and calling getattr for every node
+        handler = _VISIT_DISPATCH.get(type(node))
+        if handler is not None:
+            handler(self, node)
+        elif not isinstance(node, ast.expr):
+            # Expressions cannot contain defs or if statements: skip their subtrees
+            self.generic_visit(node)
+
+    def visit_If(self, node: ast.If) -> None:
+        """Record if/else branches (only if/else per grammar)."""
+        frame = self._stack[-1] if self._stack else None
+        if frame is not None:
+            frame.decisions += 1
+            frame.branches.append({"line": node.lineno, "type": "if", "condition": self._segment(node.test)})
+        for child in node.body:
+            self.visit(child)
+
+        # Check for else (grammar only supports if/else, not elif)
+        if frame is not None and node.orelse and not isinstance(node.orelse[0], ast.If):
+            frame.branches.append({"line": node.orelse[0].lineno, "type": "else", "condition": None})
+        for child in node.orelse:
+            self.visit(child)
+
+
+_VISIT_DISPATCH = {
+    ast.FunctionDef: _Collector.visit_FunctionDef,
+    ast.AsyncFunctionDef: _Collector.visit_AsyncFunctionDef,
+    ast.If: _Collector.visit_If,
+}
+
+
+@lru_cache(maxsize=64)
+def _analyze_source(code: str) -> Dict[str, Any]:
+    """Parse and analyze code; memoized on the source text (results are shared, never mutate)."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return {"error": str(e), "functions": [], "total_branches_in_file": 0}
+
+    collector = _Collector(code.split("\n"))
+    collector.visit(tree)
+    functions = collector.functions
+    total_branches = sum(f["total_branches"] for f in functions)
+
+    return {
+        "functions": functions,
+        "total_branches_in_file": total_branches,
+    }
+
+
+def _copy_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy the mutable containers of a cached analysis (cheaper than copy.deepcopy)."""
+    return {
+        **analysis,
+        "functions": [
+            {**f, "args": [dict(a) for a in f["args"]], "branches": [dict(b) for b in f["branches"]]}
+            for f in analysis["functions"]
+        ],
+    }
 
 
 class CodeAnalyzer:
     """
     Analyzes Python code to extract functions and detect branch points.
+    Thin facade over the module-level helpers.
     """
 
     @staticmethod
@@ -18,101 +179,13 @@ class CodeAnalyzer:
         """
         Analyze Python code and extract function information with branch detection.
 
+        Re-analyzing the same source skips ast.parse and the AST walk; each
+        call still gets its own copy of the result.
+
         Args:
             code: Python source code as string
 
         Returns:
             Dictionary with functions list and total branch count
         """
-        try:
-            tree = ast.parse(code)
-        except SyntaxError as e:
-            return {"error": str(e), "functions": [], "total_branches_in_file": 0}
-
-        functions = []
-        total_branches = 0
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_info = CodeAnalyzer._analyze_function(node)
-                functions.append(func_info)
-                total_branches += func_info.total_branches
-
-        return {
-            "functions": [CodeAnalyzer._function_to_dict(f) for f in functions],
-            "total_branches_in_file": total_branches,
-        }
-
-    @staticmethod
-    def _analyze_function(node: ast.FunctionDef) -> FunctionInfo:
-        """Analyze a single function node."""
-        name = node.name
-
-        # Extract arguments
-        args = []
-        for arg in node.args.args:
-            arg_type = CodeAnalyzer._get_annotation(arg.annotation)
-            args.append({"name": arg.arg, "type": arg_type})
-
-        # Extract return type
-        return_type = CodeAnalyzer._get_annotation(node.returns)
-
-        # Detect branches
-        branches = CodeAnalyzer._detect_branches(node)
-
-        # Calculate cyclomatic complexity (simplified)
-        # Complexity = 1 + number of decision points (only if supported by grammar)
-        complexity = 1 + len([b for b in branches if b.type == "if"])
-
-        # Total branches includes if/else (only constructs in grammar)
-        total_branches = len(branches) if branches else 0
-
-        return FunctionInfo(
-            name=name,
-            args=args,
-            return_type=return_type,
-            branches=branches,
-            cyclomatic_complexity=complexity,
-            total_branches=total_branches,
-            lineno=node.lineno,
-        )
-
-    @staticmethod
-    def _detect_branches(node: ast.AST) -> List[BranchInfo]:
-        """Detect all branch points in a function (only if/else per grammar)."""
-        branches = []
-
-        for child in ast.walk(node):
-            if isinstance(child, ast.If):
-                # If statement
-                condition = ast.unparse(child.test) if hasattr(ast, "unparse") else "condition"
-                branches.append(BranchInfo(line=child.lineno, type="if", condition=condition))
-
-                # Check for else (grammar only supports if/else, not elif)
-                if child.orelse and not isinstance(child.orelse[0], ast.If):
-                    # This is else
-                    branches.append(
-                        BranchInfo(
-                            line=child.orelse[0].lineno if child.orelse else child.lineno, type="else", condition=None
-                        )
-                    )
-
-        return branches
-
-    @staticmethod
-    def _get_annotation(node) -> str:
-        """Extract type annotation from node."""
-        if node is None:
-            return "Any"
-        if isinstance(node, ast.Name):
-            return node.id
-        if isinstance(node, ast.Constant):
-            return str(node.value)
-        if hasattr(ast, "unparse"):
-            return ast.unparse(node)
-        return "Any"
-
-    @staticmethod
-    def _function_to_dict(func: FunctionInfo) -> Dict[str, Any]:
-        """Convert FunctionInfo to dictionary."""
-        return func.model_dump()
+        return _copy_analysis(_analyze_source(code))
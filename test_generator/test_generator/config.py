@@ -8,6 +8,7 @@ SECURITY NOTE:
 - Or create .env file (add .env to .gitignore)
 """
 
+import logging
 import os
 import sys
 
@@ -43,6 +44,11 @@ except ValueError as e:
     print("WARNING: Using default value: 60", file=sys.stderr)
     TEST_EXECUTION_TIMEOUT = 60
 
+# Let pytest auto-load every installed plugin when running generated tests
+# (configurable via env var). Off (default) starts much faster and loads only
+# pytest-cov; enable it when tests need plugin fixtures (mocker, anyio, asyncio)
+PYTEST_PLUGIN_AUTOLOAD = os.getenv("PYTEST_PLUGIN_AUTOLOAD", "false").strip().lower() in ("1", "true", "yes")
+
 
 # LLM Configuration
 DEFAULT_LLM_TEMPERATURE = 0.2  # Temperature for LLM generation (0.0 = deterministic, 1.0 = creative)
@@ -53,17 +59,30 @@ API_RETRY_MIN_WAIT = 2  # Minimum wait time in seconds between retries
 API_RETRY_MAX_WAIT = 10  # Maximum wait time in seconds between retries
 API_RETRY_MULTIPLIER = 1  # Exponential backoff multiplier
 
+# On-disk LLM response cache directory (configurable via env var)
+# Empty (default) disables caching; identical prompts are then always re-sent
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "")
+
+# Age in seconds after which a cached LLM response is ignored (configurable via env var)
+# Valid range: >= 0, 0 = never expire (default: 7 days)
+try:
+    LLM_CACHE_MAX_AGE = int(os.getenv("LLM_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+    if LLM_CACHE_MAX_AGE < 0:
+        raise ValueError(f"LLM_CACHE_MAX_AGE must be >= 0, got {LLM_CACHE_MAX_AGE}")
+except ValueError as e:
+    print(f"WARNING: Invalid LLM_CACHE_MAX_AGE - {e}", file=sys.stderr)
+    print("WARNING: Using default value: 604800 (7 days)", file=sys.stderr)
+    LLM_CACHE_MAX_AGE = 7 * 24 * 3600
+
 # Code Analysis Configuration
 PYTHON_INDENT_SIZE = 4  # Number of spaces per indentation level
+ANALYSIS_CACHE_SIZE = 256  # Analyzed sources kept per orchestrator (repeated inputs skip Lark + AST)
 
 
 # ============================================================================
 # LOGGING CONFIGURATION
 # ============================================================================
 
-import logging
-import sys
-
 def setup_logging(verbose: bool = False) -> logging.Logger:
     """
     Configure structured logging for the application.
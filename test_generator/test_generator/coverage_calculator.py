@@ -4,23 +4,120 @@ Executes tests with coverage measurement and analyzes results.
 """
 
 import subprocess  # nosec B404 - Required for pytest execution with controlled arguments
+import atexit
+import itertools
+import keyword
+import logging
 import os
+import shutil
 import sys
 import json
 import re
-import shutil
+import signal
+import tempfile
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from .models import CoverageResult  # Import Pydantic model (eliminates duplication)
 from . import config
 
+try:
+    import orjson  # Optional speedup for decoding coverage.json
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Child of the "test_generator" logger configured in config
+logger = logging.getLogger(__name__)
+
+# Text fallback, one scan for all three values: the last whitespace-separated
+# "NN%" on a TOTAL line / a line mentioning branches, and the count before
+# "passed" in the pytest summary
+_PERCENT = r"(?:^|(?<=\s))(?P<{}>\d+(?:\.\d+)?)%(?=\s|$)"
+_COVERAGE_TEXT_RE = re.compile(
+    r"^(?=.*TOTAL).*" + _PERCENT.format("total")
+    + r"|^(?=.*(?i:branch)).*" + _PERCENT.format("branch")
+    + r"|(?:^|(?<=\s))(?P<passed>\d+)\s+(?i:passed)",
+    re.MULTILINE,
+)
+
+# Flags for the generated source/test files (O_BINARY: no newline translation on Windows)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# RAM-backed filesystem on Linux: per-run artifacts never touch the disk
+_SHM_DIR = "/dev/shm"
+
+
+@lru_cache(maxsize=32)
+def _pytest_argv_prefix(module_name: str, coverage_json: str) -> tuple:
+    """Build the invariant part of the pytest command line for a module.
+    
+    Args:
+        module_name: Sanitized name of the module being measured
+        coverage_json: Absolute path of the JSON coverage report
+        
+    Returns:
+        argv tuple; the test file is appended per run
+    """
+    return (
+        sys.executable,
+        "-m",
+        "pytest",
+        "-p",
+        "pytest_cov",
+        # No .pytest_cache writes: every run is a fresh test file
+        "-p",
+        "no:cacheprovider",
+        f"--cov={module_name}",
+        "--cov-branch",
+        f"--cov-report=json:{coverage_json}",
+        "--cov-report=term",  # TOTAL line used by the text fallback
+        "-q",
+        "--no-header",
+    )
+
+
+# Distinguishes the scratch files of calculators sharing the process scratch dir
+_SCRATCH_IDS = itertools.count()
+
+
+@lru_cache(maxsize=None)
+def _scratch_dir() -> str:
+    """Return the private directory for per-run test files and coverage reports.
+    
+    Created once per process (every calculator shares it, using its own file
+    names) in /dev/shm when available, otherwise in the default temporary
+    directory. The directory is removed when the interpreter exits.
+    
+    Returns:
+        Absolute path of the directory
+    """
+    parent = _SHM_DIR if os.path.isdir(_SHM_DIR) and os.access(_SHM_DIR, os.W_OK) else None
+    scratch_dir = tempfile.mkdtemp(prefix="test_generator_", dir=parent)
+    atexit.register(shutil.rmtree, scratch_dir, ignore_errors=True)
+    return scratch_dir
+
 
 class CoverageCalculator:
     """
     Runs tests with coverage and analyzes branch coverage.
     """
 
-    def __init__(self, work_dir: str = ".") -> None:
+    def __init__(self, work_dir: str = ".", timeout: Optional[int] = None) -> None:
+        """
+        Args:
+            work_dir: Directory the module under test is written to (pytest cwd)
+            timeout: Pytest timeout in seconds (default: config.TEST_EXECUTION_TIMEOUT)
+        """
+        self.timeout = timeout if timeout is not None else config.TEST_EXECUTION_TIMEOUT
+        # Normalized once: the path helpers below take it as an absolute base
         self.work_dir = os.path.abspath(work_dir)
+        # Generated test file and coverage data/report (the module under test
+        # stays in work_dir, which remains the cwd of the pytest run)
+        self.scratch_dir = _scratch_dir()
+        scratch_id = next(_SCRATCH_IDS)
+        self._test_file_name = f"test_generated_{scratch_id}.py"
+        self._coverage_data = os.path.join(self.scratch_dir, f".coverage_{scratch_id}")
+        self._coverage_json = os.path.join(self.scratch_dir, f"coverage_{scratch_id}.json")
     
     @staticmethod
     def _sanitize_module_name(name: str) -> str:
@@ -35,8 +132,8 @@ class CoverageCalculator:
         Raises:
             ValueError: If module name contains invalid characters
         """
-        # Module names must be valid Python identifiers
-        if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name):
+        # Module names must be valid (ASCII, non-keyword) Python identifiers
+        if not (name.isascii() and name.isidentifier()) or keyword.iskeyword(name):
             raise ValueError(f"Invalid module name: {name}. Must be a valid Python identifier.")
         return name
     
@@ -46,7 +143,7 @@ class CoverageCalculator:
         
         Args:
             path: Path to validate
-            base_dir: Base directory that path must be within
+            base_dir: Absolute base directory that path must be within
             
         Returns:
             Validated absolute path
@@ -56,16 +153,15 @@ class CoverageCalculator:
         """
         # Normalize and resolve to absolute path
         abs_path = os.path.abspath(path)
-        abs_base = os.path.abspath(base_dir)
         
         # Ensure path is within base directory
         try:
-            os.path.relpath(abs_path, abs_base)
+            os.path.relpath(abs_path, base_dir)
         except ValueError:
             # Different drives on Windows
             raise ValueError(f"Path outside base directory: {path}")
         
-        if not abs_path.startswith(abs_base + os.sep) and abs_path != abs_base:
+        if not abs_path.startswith(base_dir + os.sep) and abs_path != base_dir:
             raise ValueError(f"Path traversal detected: {path}")
         
         return abs_path
@@ -75,7 +171,7 @@ class CoverageCalculator:
         """Create file safely within base directory.
         
         Args:
-            base_dir: Base directory
+            base_dir: Absolute base directory
             filename: Filename (can include subdirectory)
             content: File content
             
@@ -85,25 +181,28 @@ class CoverageCalculator:
         Raises:
             ValueError: If path validation fails
         """
-        # Normalize and validate path
-        safe_path = os.path.normpath(os.path.join(base_dir, filename))
+        # Normalize and validate path (joined onto an absolute base: already absolute)
+        abs_path = os.path.normpath(os.path.join(base_dir, filename))
         
         # Ensure within base directory
-        abs_base = os.path.abspath(base_dir)
-        abs_path = os.path.abspath(safe_path)
-        
-        if not abs_path.startswith(abs_base + os.sep) and abs_path != abs_base:
+        if not abs_path.startswith(base_dir + os.sep) and abs_path != base_dir:
             raise ValueError(f"Path traversal detected in filename: {filename}")
         
-        # Create parent directories safely
+        # Create parent directories safely (plain filenames live in base_dir itself)
         parent_dir = os.path.dirname(abs_path)
-        if parent_dir and not os.path.exists(parent_dir):
+        if parent_dir != base_dir:
             os.makedirs(parent_dir, exist_ok=True)
         
-        # Write file
-        with open(abs_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        
+        # Write file straight to the descriptor (no buffered text wrapper for a one-shot write)
+        data = content.encode("utf-8")
+        fd = os.open(abs_path, _WRITE_FLAGS, 0o644)
+        try:
+            written = os.write(fd, data)
+            while written < len(data):
+                written += os.write(fd, data[written:])
+        finally:
+            os.close(fd)
+
         return abs_path
     
     def run_with_coverage(
@@ -177,14 +276,12 @@ class CoverageCalculator:
         if existing_file_path:
             # SECURITY: Validate existing file path
             code_file = self._sanitize_path(existing_file_path, self.work_dir)
-            test_file = os.path.join(self.work_dir, "test_generated.py")
         else:
             # SECURITY: Use safe file creation
             code_file = self._create_safe_file(self.work_dir, f"{module_name}.py", code)
-            test_file = os.path.join(self.work_dir, "test_generated.py")
         
-        # SECURITY: Use safe file creation for test file
-        test_file = self._create_safe_file(self.work_dir, "test_generated.py", tests)
+        # SECURITY: Use safe file creation for test file (written once, in both cases)
+        test_file = self._create_safe_file(self.scratch_dir, self._test_file_name, tests)
         
         return code_file, test_file
     
@@ -204,36 +301,62 @@ class CoverageCalculator:
         # Prepare environment
         env = os.environ.copy()
         cwd = self.work_dir
+        # Startup dominates each run: unless enabled, do not import every installed
+        # pytest11 plugin (e.g. langsmith's, which pulls in the LangChain stack);
+        # pytest-cov is always loaded explicitly via -p
+        if not config.PYTEST_PLUGIN_AUTOLOAD:
+            env["PYTEST_DISABLE_PLUGIN_AUTOLOAD"] = "1"
+        # Keep the raw .coverage data file out of work_dir as well
+        env["COVERAGE_FILE"] = self._coverage_data
         
         if existing_file_path:
             file_dir = os.path.dirname(existing_file_path)
             env["PYTHONPATH"] = file_dir + os.pathsep + env.get("PYTHONPATH", "")
         
-        # Run pytest with coverage (secured: list format, no shell, sanitized args)
-        result = subprocess.run(  
-            [
-                sys.executable,
-                "-m",
-                "pytest",
-                test_file,
-                f"--cov={module_name}",
-                "--cov-branch",
-                "--cov-report=json",
-                "--cov-report=term",
-                "-v",
-            ],
-            capture_output=True,
+        # Run pytest with coverage (secured: list format, no shell, sanitized args).
+        # Own session/process group, so a timeout also kills helpers pytest spawned
+        if os.name == "posix":
+            group_kwargs = {"start_new_session": True}
+        else:
+            group_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        argv = _pytest_argv_prefix(module_name, self._coverage_json) + (test_file,)
+        proc = subprocess.Popen(  
+            argv,
+            # One pipe: stderr is interleaved into stdout, no second buffer to concatenate
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
             cwd=cwd,
             env=env,
-            timeout=config.TEST_EXECUTION_TIMEOUT,
+            **group_kwargs,
         )
         
-        output = result.stdout + "\n" + result.stderr
-        success = result.returncode == 0
+        try:
+            output, _ = proc.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self._kill_process_group(proc)
+            proc.communicate()
+            raise
+        
+        success = proc.returncode == 0
         
         return output, success
     
+    @staticmethod
+    def _kill_process_group(proc: subprocess.Popen) -> None:
+        """Kill a timed-out pytest run together with every process it started.
+        
+        Args:
+            proc: pytest process, started as the leader of its own process group
+        """
+        if os.name == "posix":
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass  # Already exited
+        else:
+            proc.kill()
+    
     def _parse_results(self, output: str, success: bool) -> CoverageResult:
         """Parse pytest coverage results.
         
@@ -276,14 +399,11 @@ class CoverageCalculator:
 
     def _parse_coverage_json(self) -> Optional[Dict[str, Any]]:
         """Parse coverage JSON report."""
-        coverage_file = os.path.join(self.work_dir, "coverage.json")
-
-        if not os.path.exists(coverage_file):
-            return None
+        coverage_file = self._coverage_json
 
         try:
-            with open(coverage_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(coverage_file, "rb") as f:
+                data = _json_loads(f.read())
 
             # Extract coverage percentages
             totals = data.get("totals", {})
@@ -295,12 +415,11 @@ class CoverageCalculator:
             branch_coverage = (covered_branches / num_branches * 100) if num_branches > 0 else 0.0
 
             # Find uncovered branches
-            uncovered_branches = []
-            files = data.get("files", {})
-            for filename, file_data in files.items():
-                missing_branches = file_data.get("missing_branches", [])
-                for branch in missing_branches:
-                    uncovered_branches.append({"file": filename, "line": branch})
+            uncovered_branches = [
+                {"file": filename, "line": branch}
+                for filename, file_data in data.get("files", {}).items()
+                for branch in file_data.get("missing_branches", ())
+            ]
 
             # Count tests (simplified - would need pytest-json-report for accurate count)
             tests_run = 0
@@ -314,60 +433,36 @@ class CoverageCalculator:
                 "tests_passed": tests_passed,
             }
 
+        except FileNotFoundError:
+            # No JSON report (e.g. pytest crashed before coverage wrote it)
+            return None
         except Exception as e:
-            logger = config.setup_logging()
             logger.error(f"Error parsing coverage JSON: {e}")
             return None
         finally:
-            # Cleanup coverage files
-            if os.path.exists(coverage_file):
-                os.remove(coverage_file)
-            coverage_html_dir = os.path.join(self.work_dir, "htmlcov")
-            if os.path.exists(coverage_html_dir):
-
-                shutil.rmtree(coverage_html_dir)
+            # Cleanup coverage report (unlink directly: no stat before removal).
+            # No HTML report is requested, so there is no htmlcov/ to remove.
+            try:
+                os.unlink(coverage_file)
+            except FileNotFoundError:
+                pass
 
     def _parse_coverage_from_text(self, output: str, success: bool) -> CoverageResult:
         """Fallback: Parse coverage from text output."""
-        # Simple text parsing
+        # Example: "TOTAL    100    0    100%", "=== 3 passed in 0.12s ==="
+        # Last match wins, as when scanning line by line
         branch_coverage = 0.0
         total_coverage = 0.0
-
-        for line in output.split("\n"):
-            # Look for coverage percentage in output
-            # Example: "TOTAL    100    0    100%"
-            if "%" in line and "TOTAL" in line:
-                parts = line.split()
-                for part in parts:
-                    if "%" in part:
-                        try:
-                            total_coverage = float(part.replace("%", ""))
-                        except ValueError:
-                            pass
-
-            # Branch coverage might be shown differently
-            if "branch" in line.lower() and "%" in line:
-                parts = line.split()
-                for part in parts:
-                    if "%" in part:
-                        try:
-                            branch_coverage = float(part.replace("%", ""))
-                        except ValueError:
-                            pass
-
-        # Count tests
-        tests_run = 0
         tests_passed = 0
-        for line in output.split("\n"):
-            if "passed" in line.lower():
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if "passed" in part.lower() and i > 0:
-                        try:
-                            tests_passed = int(parts[i - 1])
-                            tests_run = tests_passed
-                        except ValueError:
-                            pass
+        for match in _COVERAGE_TEXT_RE.finditer(output):
+            kind = match.lastgroup
+            if kind == "total":
+                total_coverage = float(match.group("total"))
+            elif kind == "branch":
+                branch_coverage = float(match.group("branch"))
+            else:
+                tests_passed = int(match.group("passed"))
+        tests_run = tests_passed
 
         return CoverageResult(
             success=success,
@@ -4,14 +4,29 @@ Simplified implementation using only Google Generative AI.
 """
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Optional
+import hashlib
+import os
 import re
+import tempfile
+import time
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from . import config
 
 
+# Sensitive-data patterns, compiled once for _mask_sensitive_data
+# Bearer tokens
+_BEARER_RE = re.compile(r'(Bearer\s+)([A-Za-z0-9_\-\.]+)')
+# API keys (common patterns)
+_API_KEY_RE = re.compile(r'(api[-_]?key["\']?\s*[=:]\s*["\']?)([A-Za-z0-9_\-]+)', re.IGNORECASE)
+# Tokens (common patterns)
+_TOKEN_RE = re.compile(r'(token["\']?\s*[=:]\s*["\']?)([A-Za-z0-9_\-\.]+)', re.IGNORECASE)
+_REDACTED = r'\1***REDACTED***'
+
+
 def _mask_sensitive_data(text: str) -> str:
     """Mask sensitive data in text for safe logging.
     
@@ -21,25 +36,35 @@ def _mask_sensitive_data(text: str) -> str:
     Returns:
         Text with sensitive data masked
     """
-    # Mask Bearer tokens
-    text = re.sub(r'(Bearer\s+)([A-Za-z0-9_\-\.]+)', r'\1***REDACTED***', text)
-    # Mask API keys (common patterns)
-    text = re.sub(
-        r'(api[-_]?key["\']?\s*[=:]\s*["\']?)([A-Za-z0-9_\-]+)',
-        r'\1***REDACTED***',
-        text,
-        flags=re.IGNORECASE
-    )
-    # Mask tokens (common patterns)
-    text = re.sub(
-        r'(token["\']?\s*[=:]\s*["\']?)([A-Za-z0-9_\-\.]+)',
-        r'\1***REDACTED***',
-        text,
-        flags=re.IGNORECASE
-    )
+    text = _BEARER_RE.sub(_REDACTED, text)
+    text = _API_KEY_RE.sub(_REDACTED, text)
+    text = _TOKEN_RE.sub(_REDACTED, text)
     return text
 
 
+@lru_cache(maxsize=8)
+def _get_chat_model(api_key: str, model: str, temperature: float) -> ChatGoogleGenerativeAI:
+    """Return a shared Gemini chat model for the given settings.
+    
+    Building the model creates the underlying API client (SSL contexts,
+    HTTP connection pool), so clients with identical settings reuse one
+    instance and its open connections.
+    
+    Args:
+        api_key: Google API key for Gemini
+        model: Model name
+        temperature: Sampling temperature
+        
+    Returns:
+        ChatGoogleGenerativeAI instance
+    """
+    return ChatGoogleGenerativeAI(
+        google_api_key=api_key,
+        model=model,
+        temperature=temperature,
+    )
+
+
 class BaseLLMClient(ABC):
     """Base LLM client interface."""
     
@@ -62,6 +87,7 @@ class LangChainLLMClient(BaseLLMClient):
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         verbose: bool = False,
+        cache_dir: Optional[str] = None,
     ) -> None:
         """
         Initialize LangChain LLM client for Google Gemini.
@@ -72,6 +98,8 @@ class LangChainLLMClient(BaseLLMClient):
             model: Model name (default: gemini-2.5-flash)
             temperature: Sampling temperature (0.0-1.0, default from config)
             verbose: Enable verbose logging
+            cache_dir: Directory for the on-disk response cache
+                (default: config.LLM_CACHE_DIR, empty disables caching)
         """
         if provider != "google":
             raise ValueError(
@@ -89,12 +117,22 @@ class LangChainLLMClient(BaseLLMClient):
         if self.verbose:
             self.logger.info("Initializing Google Gemini provider")
         
-        # Initialize Google Gemini LLM
-        self.llm = ChatGoogleGenerativeAI(
-            google_api_key=api_key,
-            model=model or "gemini-2.5-flash",  # Gemini 2.5 Flash (v1beta compatible)
-            temperature=self.temperature,  # FIX: Use self.temperature (guaranteed float) not parameter
-        )
+        self.model = model or "gemini-2.5-flash"  # Gemini 2.5 Flash (v1beta compatible)
+        
+        # Optional response cache: identical requests are answered from disk
+        self.cache_dir = cache_dir if cache_dir is not None else config.LLM_CACHE_DIR
+        if self.cache_dir:
+            self.cache_dir = os.path.abspath(os.path.expanduser(self.cache_dir))
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError as e:
+                # Best-effort cache: an unusable directory only disables it
+                self.logger.warning(f"LLM cache disabled, cannot use {self.cache_dir}: {e}")
+                self.cache_dir = ""
+        
+        # Initialize Google Gemini LLM (shared by clients with the same settings)
+        # FIX: Use self.temperature (guaranteed float) not parameter
+        self.llm = _get_chat_model(api_key, self.model, self.temperature)
     
     @retry(
         stop=stop_after_attempt(config.API_RETRY_ATTEMPTS),
@@ -121,24 +159,82 @@ class LangChainLLMClient(BaseLLMClient):
         Raises:
             RuntimeError: If API call fails after all retry attempts
         """
-        messages = []
-        
-        if system_prompt:
-            messages.append(SystemMessage(content=system_prompt))
-        
-        messages.append(HumanMessage(content=prompt))
+        cache_key = self._cache_key(prompt, system_prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.llm.invoke(messages)
-            
-            # Handle both string and list responses from Google Gemini
-            content = response.content
-            if isinstance(content, list):
-                content = "".join(str(part) for part in content)
-            
-            return content.strip()
+            response = self.llm.invoke(self._build_messages(prompt, system_prompt))
+            content = self._extract_content(response)
         except Exception as e:
             error_msg = f"Error calling Google Gemini API: {str(e)}"
             if self.verbose:
                 self.logger.error(_mask_sensitive_data(error_msg))
             raise RuntimeError(error_msg) from e
+        
+        self._cache_put(cache_key, content)
+        return content
+
+    def _cache_key(self, prompt: str, system_prompt: Optional[str]) -> str:
+        """Return the cache key of a request (model, temperature and both prompts)."""
+        payload = "\x00".join((self.model, repr(self.temperature), system_prompt or "", prompt))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return the cached completion for key, or None on a miss, an expired
+        entry (older than config.LLM_CACHE_MAX_AGE) or when caching is off."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, f"{key}.txt"), "r", encoding="utf-8") as f:
+                max_age = config.LLM_CACHE_MAX_AGE
+                if max_age and time.time() - os.fstat(f.fileno()).st_mtime > max_age:
+                    return None  # Stale: refetched and overwritten by _cache_put
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            # Unreadable or corrupted entry: treat as a miss, _cache_put overwrites it
+            self.logger.warning(f"Could not read LLM cache entry: {e}")
+            return None
+
+    def _cache_put(self, key: str, content: str) -> None:
+        """Store a completion in the cache (no-op when caching is off)."""
+        if not self.cache_dir:
+            return
+        tmp_path = None
+        try:
+            # Write then rename: concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, os.path.join(self.cache_dir, f"{key}.txt"))
+        except OSError as e:
+            self.logger.warning(f"Could not write LLM cache entry: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str]) -> list:
+        """Build the LangChain message list for a single prompt."""
+        messages = []
+        
+        if system_prompt:
+            messages.append(SystemMessage(content=system_prompt))
+        
+        messages.append(HumanMessage(content=prompt))
+        return messages
+
+    @staticmethod
+    def _extract_content(response) -> str:
+        """Return the stripped text of a LangChain chat response."""
+        # Handle both string and list responses from Google Gemini
+        content = response.content
+        if isinstance(content, list):
+            content = "".join(str(part) for part in content)
+        
+        return content.strip()
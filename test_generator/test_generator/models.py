@@ -31,6 +31,33 @@ class BranchMap(BaseModel):
     functions: List[FunctionInfo] = Field(..., description="List of analyzed functions")
     total_branches_in_file: int = Field(..., ge=0)
 
+    @classmethod
+    def from_analysis(cls, data: BranchMapDict) -> "BranchMap":
+        """Build a BranchMap from CodeAnalyzer output without re-validating it.
+        
+        The analyzer produces exactly this schema, so nested models are created
+        with model_construct instead of running the validators on every field.
+        
+        Args:
+            data: Branch map dictionary returned by CodeAnalyzer.analyze_file
+            
+        Returns:
+            BranchMap with FunctionInfo/BranchInfo instances
+        """
+        functions = [
+            FunctionInfo.model_construct(
+                **{
+                    **func,
+                    "branches": [BranchInfo.model_construct(**branch) for branch in func["branches"]],
+                }
+            )
+            for func in data["functions"]
+        ]
+        return cls.model_construct(
+            functions=functions,
+            total_branches_in_file=data["total_branches_in_file"],
+        )
+
 
 class CoverageResult(BaseModel):
     """Result of coverage analysis."""
@@ -52,13 +79,17 @@ class AgentState(BaseModel):
     
     # Intermediate results
     branch_map: Optional[BranchMap] = None
+    branch_map_json: str = Field(default="", description="branch_map serialized once for the prompts")
     tests: str = Field(default="")
+    test_count: int = Field(default=0, ge=0, description='Number of "def test_" definitions in tests')
     coverage_result: Optional[CoverageResult] = None
     
     # Iteration tracking
     iteration: int = Field(default=0, ge=0)
     max_iterations: int = Field(default=5, ge=1)
     coverage_history: List[float] = Field(default_factory=list, description="Track coverage % per iteration for stagnation detection")
+    uncovered_fingerprint: Optional[int] = Field(default=None, description="Hash of the last reported uncovered branch set")
+    uncovered_unchanged: bool = Field(default=False, description="Last measurement reported the same uncovered branches as the previous one")
     
     # Final results
     success: bool = Field(default=False)
@@ -3,18 +3,47 @@ LangGraph-based orchestrator for multi-agent test generation.
 Replaces sequential workflow with state machine for better control flow.
 """
 
-from typing import Literal
+import hashlib
+from collections import OrderedDict
+from typing import Literal, Tuple
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from .models import AgentState, BranchMap, CoverageResult
 from .agents import CodeAnalyzerAgent, UnitTestGeneratorAgent, CoverageOptimizerAgent
 from .llm_client import LangChainLLMClient
 from .coverage_calculator import CoverageCalculator
+from .prompts import serialize_branch_map
 from . import config
 
+# Separator line of the verbose step banners
+_BANNER = "=" * 60
+
+
+def _dispatch(method_name: str):
+    """Wrap an orchestrator method as a graph callable.
+    
+    The compiled graph is shared by all instances, so the instance running
+    the workflow is taken from the run config (see generate_tests).
+    
+    Args:
+        method_name: Name of the LangGraphOrchestrator method to call
+        
+    Returns:
+        Callable taking (state, config), as accepted by LangGraph
+    """
+    def call(state: AgentState, config: RunnableConfig):
+        return getattr(config["configurable"]["orchestrator"], method_name)(state)
+    
+    call.__name__ = method_name
+    return call
+
 
 class LangGraphOrchestrator:
     """Graph-based orchestrator using LangGraph state machine."""
     
+    # Compiled once per class: the topology does not depend on the instance
+    _compiled_workflow = None
+    
     def __init__(
         self,
         provider: str = None,
@@ -65,10 +94,24 @@ class LangGraphOrchestrator:
         self.coverage_optimizer = CoverageOptimizerAgent(self.client)
         self.coverage_calc = CoverageCalculator()
         
-        # Build LangGraph workflow
-        self.workflow = self._build_workflow()
+        # Analysis results of previously seen sources (LRU, keyed by content hash)
+        self._analysis_cache: "OrderedDict[bytes, Tuple[BranchMap, str]]" = OrderedDict()
+        
+        # Shared LangGraph workflow (built on first use)
+        self.workflow = self._get_workflow()
     
-    def _build_workflow(self) -> StateGraph:
+    @classmethod
+    def _get_workflow(cls):
+        """Return the compiled workflow of this class, building it on first use."""
+        # Looked up in the class's own __dict__: a subclass gets its own graph
+        workflow = cls.__dict__.get("_compiled_workflow")
+        if workflow is None:
+            workflow = cls._build_workflow()
+            cls._compiled_workflow = workflow
+        return workflow
+    
+    @staticmethod
+    def _build_workflow() -> StateGraph:
         """Build the LangGraph state machine.
         
         Workflow:
@@ -82,10 +125,10 @@ class LangGraphOrchestrator:
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("analyze", self._analyze_node)
-        workflow.add_node("generate", self._generate_node)
-        workflow.add_node("measure", self._measure_node)
-        workflow.add_node("optimize", self._optimize_node)
+        workflow.add_node("analyze", _dispatch("_analyze_node"))
+        workflow.add_node("generate", _dispatch("_generate_node"))
+        workflow.add_node("measure", _dispatch("_measure_node"))
+        workflow.add_node("optimize", _dispatch("_optimize_node"))
         
         # Add edges
         workflow.set_entry_point("analyze")
@@ -93,7 +136,7 @@ class LangGraphOrchestrator:
         workflow.add_edge("generate", "measure")
         workflow.add_conditional_edges(
             "measure",
-            self._should_optimize,
+            _dispatch("_should_optimize"),
             {
                 "optimize": "optimize",
                 "end": END,
@@ -106,17 +149,32 @@ class LangGraphOrchestrator:
     def _analyze_node(self, state: AgentState) -> AgentState:
         """Node: Analyze code and detect branches using Lark + AST."""
         if self.verbose:
-            self.logger.info("="*60)
+            self.logger.info(_BANNER)
             self.logger.info("STEP 1: CODE ANALYSIS")
-            self.logger.info("="*60)
+            self.logger.info(_BANNER)
         
         try:
-            branch_map_dict = self.code_analyzer.analyze(state.code)
-            state.branch_map = BranchMap(**branch_map_dict)
+            cache_key = hashlib.blake2b(state.code.encode("utf-8"), digest_size=16).digest()
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                # Same source seen before (e.g. a shared helper in a repo scan)
+                self._analysis_cache.move_to_end(cache_key)
+                state.branch_map, state.branch_map_json = cached
+            else:
+                branch_map_dict = self.code_analyzer.analyze(state.code)
+                # Trusted analyzer output: build the models without a second validation pass
+                state.branch_map = BranchMap.from_analysis(branch_map_dict)
+                # Immutable from here on: serialize once for every prompt of this run
+                state.branch_map_json = serialize_branch_map(branch_map_dict)
+                self._analysis_cache[cache_key] = (state.branch_map, state.branch_map_json)
+                if len(self._analysis_cache) > config.ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
             
             if self.verbose:
                 total_branches = state.branch_map.total_branches_in_file
-                self.logger.info(f"Analyzing: {len(state.branch_map.functions)} function(s), {total_branches} branch(es)")
+                self.logger.info(
+                    "Analyzing: %d function(s), %d branch(es)", len(state.branch_map.functions), total_branches
+                )
         
         except SyntaxError as e:
             # Lark grammar validation failed
@@ -141,22 +199,23 @@ class LangGraphOrchestrator:
     def _generate_node(self, state: AgentState) -> AgentState:
         """Node: Generate initial test suite."""
         if self.verbose:
-            self.logger.info("="*60)
+            self.logger.info(_BANNER)
             self.logger.info("STEP 2: INITIAL TEST GENERATION")
-            self.logger.info("="*60)
+            self.logger.info(_BANNER)
         
         try:
             tests = self.test_generator.generate_tests(
                 state.code,
-                state.branch_map.model_dump(),
+                state.branch_map_json,
                 state.module_name,
                 verbose=self.verbose
             )
             state.tests = tests
+            # Counted once per chunk of tests, then kept up to date incrementally
+            state.test_count = tests.count("def test_")
             
             if self.verbose:
-                test_count = tests.count("def test_")
-                self.logger.info(f"Generated {test_count} test(s)")
+                self.logger.info("Generated %d test(s)", state.test_count)
         
         except Exception as e:
             # LLM generation or extraction errors
@@ -172,36 +231,37 @@ class LangGraphOrchestrator:
     def _measure_node(self, state: AgentState) -> AgentState:
         """Node: Measure coverage."""
         if self.verbose:
-            self.logger.info("="*60)
+            self.logger.info(_BANNER)
             self.logger.info("STEP 3: COVERAGE MEASUREMENT")
-            self.logger.info("="*60)
+            self.logger.info(_BANNER)
         
         try:
-            coverage_result = self.coverage_calc.run_with_coverage(
+            # Already a validated CoverageResult: stored as is, not rebuilt field by field
+            state.coverage_result = self.coverage_calc.run_with_coverage(
                 state.code,
                 state.tests,
                 state.module_name
             )
             
-            # Convert to Pydantic model
-            state.coverage_result = CoverageResult(
-                success=coverage_result.success,
-                total_coverage=coverage_result.total_coverage,
-                branch_coverage=coverage_result.branch_coverage,
-                uncovered_branches=coverage_result.uncovered_branches,
-                tests_run=coverage_result.tests_run,
-                tests_passed=coverage_result.tests_passed,
-                output=coverage_result.output,
-                error=coverage_result.error
-            )
-            
-            # Check if target reached
+            # Check if target reached (branch-free code: passing tests are all it takes)
             if state.coverage_result.branch_coverage >= state.target_coverage:
                 state.success = True
+            elif state.branch_map.total_branches_in_file == 0 and state.coverage_result.success:
+                state.success = True
+            
+            # Remember which branches are still uncovered, to spot an exact repeat
+            uncovered = state.coverage_result.uncovered_branches
+            fingerprint = hash(frozenset(
+                (branch.get("file"), tuple(branch.get("line") or ())) for branch in uncovered
+            ))
+            state.uncovered_unchanged = bool(uncovered) and fingerprint == state.uncovered_fingerprint
+            state.uncovered_fingerprint = fingerprint
             
-            test_count = state.tests.count("def test_")
             if self.verbose:
-                self.logger.info(f"Generated {test_count} test(s) -> Coverage: {state.coverage_result.branch_coverage:.1f}% (target: {state.target_coverage}%)")
+                self.logger.info(
+                    "Generated %d test(s) -> Coverage: %.1f%% (target: %s%%)",
+                    state.test_count, state.coverage_result.branch_coverage, state.target_coverage,
+                )
         
         except Exception as e:
             # Coverage execution or parsing errors
@@ -223,6 +283,9 @@ class LangGraphOrchestrator:
             state.success = False
             # Don't raise - allow workflow to end gracefully
         
+        # Recorded here: state changes made in a conditional edge are not kept by LangGraph
+        state.coverage_history.append(state.coverage_result.branch_coverage)
+        
         return state
     
     def _optimize_node(self, state: AgentState) -> AgentState:
@@ -230,27 +293,36 @@ class LangGraphOrchestrator:
         state.iteration += 1
         
         if self.verbose:
-            self.logger.info("="*60)
-            self.logger.info(f"OPTIMIZATION ITERATION {state.iteration}/{state.max_iterations}")
-            self.logger.info("="*60)
+            self.logger.info(_BANNER)
+            self.logger.info("OPTIMIZATION ITERATION %d/%d", state.iteration, state.max_iterations)
+            self.logger.info(_BANNER)
             gap = state.target_coverage - state.coverage_result.branch_coverage
-            self.logger.info(f"Gap: {gap:.1f}%")
+            self.logger.info("Gap: %.1f%%", gap)
+        
+        # Only the fields the optimizer prompt reads (no full model_dump of the pytest output)
+        coverage_summary = {
+            "branch_coverage": state.coverage_result.branch_coverage,
+            "total_coverage": state.coverage_result.total_coverage,
+            "uncovered_branches": state.coverage_result.uncovered_branches,
+        }
         
         try:
             additional_tests = self.coverage_optimizer.optimize_coverage(
                 code=state.code,
                 current_tests=state.tests,
-                coverage_result=state.coverage_result.model_dump(),
-                branch_map=state.branch_map.model_dump(),
+                coverage_result=coverage_summary,
+                branch_map=state.branch_map_json,
                 module_name=state.module_name,
                 verbose=self.verbose,
             )
             
-            state.tests = state.tests + "\n\n" + additional_tests
+            if additional_tests:
+                state.tests = state.tests + "\n\n" + additional_tests
+            new_tests = additional_tests.count("def test_")
+            state.test_count += new_tests
             
             if self.verbose:
-                new_tests = additional_tests.count("def test_")
-                self.logger.info(f"Generated {new_tests} additional test(s)")
+                self.logger.info("Generated %d additional test(s)", new_tests)
         
         except Exception as e:
             # Optimization failed, but don't crash - just log and continue
@@ -272,15 +344,30 @@ class LangGraphOrchestrator:
         # Check iteration limit
         if state.iteration >= state.max_iterations:
             if self.verbose:
-                self.logger.info(f"Max iterations ({state.max_iterations}) reached")
+                self.logger.info("Max iterations (%d) reached", state.max_iterations)
             return "end"
         
-        # Stagnation detection: Track coverage history and detect lack of improvement
         if state.coverage_result:
             current_coverage = state.coverage_result.branch_coverage
-            state.coverage_history.append(current_coverage)
             
-            # Check for stagnation: no improvement in last 3 iterations
+            # Nothing left for the optimizer to target (e.g. code without branches, or a
+            # failed/timed-out run): re-measuring the same suite could not change anything
+            if not state.coverage_result.uncovered_branches:
+                if self.verbose:
+                    self.logger.info("No uncovered branches reported. Stopping optimization.")
+                return "end"
+            
+            # The last optimization did not cover a single additional branch
+            if state.uncovered_unchanged:
+                if self.verbose:
+                    self.logger.warning(
+                        "Uncovered branches unchanged after iteration %d "
+                        "(coverage: %.1f%%). Stopping optimization.",
+                        state.iteration, current_coverage,
+                    )
+                return "end"
+            
+            # Stagnation: no improvement in last 3 iterations (history kept by _measure_node)
             if len(state.coverage_history) >= 3:
                 last_3 = state.coverage_history[-3:]
                 improvement = max(last_3) - min(last_3)
@@ -289,9 +376,10 @@ class LangGraphOrchestrator:
                 if improvement < 1.0:
                     if self.verbose:
                         self.logger.warning(
-                            f"Coverage stagnated at {current_coverage:.1f}% "
-                            f"(improvement: {improvement:.2f}% over last 3 iterations). "
-                            f"Stopping optimization."
+                            "Coverage stagnated at %.1f%% "
+                            "(improvement: %.2f%% over last 3 iterations). "
+                            "Stopping optimization.",
+                            current_coverage, improvement,
                         )
                     return "end"
         
@@ -319,8 +407,8 @@ class LangGraphOrchestrator:
             target_coverage = config.TARGET_BRANCH_COVERAGE
         
         if self.verbose:
-            self.logger.info(f"Starting test generation for module: {module_name}")
-            self.logger.info(f"Target branch coverage: {target_coverage}%")
+            self.logger.info("Starting test generation for module: %s", module_name)
+            self.logger.info("Target branch coverage: %s%%", target_coverage)
         
         # Create initial state
         initial_state = AgentState(
@@ -331,23 +419,25 @@ class LangGraphOrchestrator:
         )
         
         # Run workflow
-        final_state = self.workflow.invoke(initial_state)
+        final_state = self.workflow.invoke(
+            initial_state, config={"configurable": {"orchestrator": self}}
+        )
         
         # Calculate final results
-        test_count = final_state["tests"].count("def test_")
+        test_count = final_state["test_count"]
         success = final_state["success"]
         
         if self.verbose:
-            self.logger.info("=" * 60)
+            self.logger.info(_BANNER)
             self.logger.info("DETAILED RESULTS")
-            self.logger.info("=" * 60)
-            self.logger.info(f"Status: {'SUCCESS' if success else 'FAILED'}")
-            self.logger.info(f"Branch Coverage: {final_state['coverage_result'].branch_coverage:.1f}% "
-                             f"(target: {target_coverage}%)")
-            self.logger.info(f"Statement Coverage: {final_state['coverage_result'].total_coverage:.1f}%")
-            self.logger.info(f"Tests Generated: {test_count}")
-            self.logger.info(f"Optimization Iterations: {final_state['iteration']}")
-            self.logger.info("=" * 60)
+            self.logger.info(_BANNER)
+            self.logger.info("Status: %s", "SUCCESS" if success else "FAILED")
+            self.logger.info("Branch Coverage: %.1f%% (target: %s%%)",
+                             final_state["coverage_result"].branch_coverage, target_coverage)
+            self.logger.info("Statement Coverage: %.1f%%", final_state["coverage_result"].total_coverage)
+            self.logger.info("Tests Generated: %d", test_count)
+            self.logger.info("Optimization Iterations: %d", final_state["iteration"])
+            self.logger.info(_BANNER)
         
         # Return results
         return {
@@ -3,8 +3,11 @@ System prompts for each specialized agent.
 Includes both system prompts (agent roles) and user prompt builders (dynamic content).
 """
 
+import io
 import json
-from typing import Dict, Any
+import tokenize
+from functools import lru_cache
+from typing import Dict, Any, Union
 from .models import BranchMapDict
 
 
@@ -70,9 +73,65 @@ STRATEGY:
 # USER PROMPT BUILDERS (Dynamic Content)
 # ============================================================================
 
+def _to_json(data: Any) -> str:
+    """Serialize prompt payloads as compact JSON (no indentation, fewer tokens).
+
+    Strings are taken as already serialized JSON and returned unchanged.
+    """
+    if isinstance(data, str):
+        return data
+    return json.dumps(data, separators=(",", ":"))
+
+
+def serialize_branch_map(branch_map: BranchMapDict) -> str:
+    """
+    Serialize a branch map once, for reuse across every prompt of a pipeline run.
+
+    Args:
+        branch_map: Branch map from CodeAnalyzer
+
+    Returns:
+        Compact JSON accepted as branch_map by the prompt builders
+    """
+    return _to_json(branch_map)
+
+
+@lru_cache(maxsize=32)
+def _strip_comments(code: str) -> str:
+    """
+    Remove comments from source code without shifting line numbers.
+
+    Comment-only lines become empty lines, so the line numbers in the
+    coverage report still match the code shown to the LLM.
+
+    Args:
+        code: Python source code
+
+    Returns:
+        Code without comments (unchanged if it cannot be tokenized)
+    """
+    try:
+        comments = [
+            token.start
+            for token in tokenize.generate_tokens(io.StringIO(code).readline)
+            if token.type == tokenize.COMMENT
+        ]
+    except (tokenize.TokenError, SyntaxError):
+        return code
+    if not comments:
+        return code
+
+    lines = code.splitlines(keepends=True)
+    for row, col in comments:
+        line = lines[row - 1]
+        line_ending = line[len(line.rstrip("\r\n")):]
+        lines[row - 1] = line[:col].rstrip() + line_ending
+    return "".join(lines)
+
+
 def build_test_generation_prompt(
     code: str, 
-    branch_map: BranchMapDict, 
+    branch_map: Union[BranchMapDict, str], 
     module_name: str
 ) -> str:
     """
@@ -80,7 +139,7 @@ def build_test_generation_prompt(
     
     Args:
         code: Source code to test
-        branch_map: Branch map from CodeAnalyzer
+        branch_map: Branch map from CodeAnalyzer (or its serialize_branch_map JSON)
         module_name: Name of the module being tested
         
     Returns:
@@ -93,7 +152,7 @@ def build_test_generation_prompt(
 ```
 
 Branch Map (branches to cover):
-{json.dumps(branch_map, indent=2)}
+{_to_json(branch_map)}
 
 Requirements:
 1. Generate tests for EVERY branch in the branch map
@@ -109,7 +168,7 @@ def build_coverage_optimization_prompt(
     code: str,
     current_tests: str,
     coverage_result: Dict[str, Any],
-    branch_map: BranchMapDict,
+    branch_map: Union[BranchMapDict, str],
     module_name: str
 ) -> str:
     """
@@ -119,7 +178,7 @@ def build_coverage_optimization_prompt(
         code: Source code
         current_tests: Existing test suite
         coverage_result: Coverage report with uncovered branches
-        branch_map: Original branch map
+        branch_map: Original branch map (or its serialize_branch_map JSON)
         module_name: Module name
         
     Returns:
@@ -128,27 +187,32 @@ def build_coverage_optimization_prompt(
     uncovered = coverage_result.get("uncovered_branches", [])
     branch_coverage = coverage_result.get("branch_coverage", 0)
     
-    return f"""The current test suite has {branch_coverage:.1f}% branch coverage.
-
-Original Code:
+    # Comments were already seen in the initial prompt; the branch map and the
+    # uncovered lines carry what the optimizer needs (line numbers preserved).
+    # Stable sections first (code, branch map, then the append-only test suite)
+    # and per-iteration numbers last: the shared prefix across optimization
+    # rounds stays eligible for Gemini's implicit prompt caching.
+    return f"""Original Code:
 ```python
-{code}
+{_strip_comments(code)}
 ```
 
+Branch Map:
+{_to_json(branch_map)}
+
 Current Tests:
 ```python
 {current_tests}
 ```
 
+The current test suite has {branch_coverage:.1f}% branch coverage.
+
 Coverage Report:
 - Branch Coverage: {branch_coverage:.1f}%
 - Uncovered Branches: {len(uncovered)}
 
-Branch Map:
-{json.dumps(branch_map, indent=2)}
-
 Uncovered Branches:
-{json.dumps(uncovered, indent=2)}
+{_to_json(uncovered)}
 
 Generate ADDITIONAL tests to cover the uncovered branches. Focus on:
 1. Branches with lowest coverage